@@ -0,0 +1,68 @@
+"""
+Compile the Numba kernels ahead of time, so that sa.py and es.py start
+without JIT warm-up.
+
+Every kernel is declared with cache=True: running it once stores the
+machine code in __pycache__, and later runs load it from there.
+This script calls each kernel once on a tiny instance, for each solution
+dtype (uint8, uint16, int32), with the argument types used by SA and ES.
+
+Numba's cache does not notice when a kernel called from another file
+changes: after editing utils.py, sa.py and es.py would keep running stale
+machine code. build() therefore deletes the cached files (*.nbi, *.nbc)
+first, so rerun this script after changing any kernel.
+
+Usage:
+    python build_kernels.py
+"""
+
+import os
+import glob
+import time
+import numpy as np
+from utils import (make_random_solution, compute_makespan,
+                   compute_makespans, get_neighbor_nb)
+from sa import _sa_core
+from es import mutate_nb, _make_offspring_nb
+
+
+def tiny_instance():
+    """2 jobs × 2 machines."""
+    return {
+        'num_jobs': 2,
+        'num_machines': 2,
+        'jobs': [[(0, 3), (1, 2)], [(1, 2), (0, 4)]],
+        'machines': np.array([[0, 1], [1, 0]], np.int32),
+        'durations': np.array([[3, 2], [2, 4]], np.int32)
+    }
+
+
+def clear_cache():
+    """Delete Numba's cached kernels (*.nbi / *.nbc) next to these scripts."""
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+    for path in glob.glob(os.path.join(cache_dir, '*.nb[ic]')):
+        os.remove(path)
+
+
+def build():
+    clear_cache()
+    rng = np.random.default_rng(0)
+    instance = tiny_instance()
+
+    for dtype in (np.uint8, np.uint16, np.int32):
+        start = time.time()
+        solution = make_random_solution(2, 2, rng).astype(dtype)
+
+        cost = compute_makespan(solution, instance)
+        compute_makespans(np.stack([solution, solution]), instance)
+        get_neighbor_nb(solution, rng)
+        mutate_nb(solution, 1, rng)
+        _make_offspring_nb(np.stack([solution, solution]), rng.integers(0, 1, size=1), 1, 1, rng)
+        _sa_core(solution.copy(), cost, instance['machines'], instance['durations'],
+                 2, 2, 1.0, 0.5, 0.1, 1, rng)
+
+        print(f"Compiled kernels for {np.dtype(dtype).name} solutions ({time.time() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    build()
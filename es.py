@@ -7,76 +7,112 @@ Usage:
 """
 
 import sys
-import random
+import numpy as np
+from numba import njit
 from utils import (parse_instances, parse_single_instance,
-                   make_random_solution, compute_makespan, get_neighbor,
-                   decode_solution, plot_gantt)
+                   make_random_solution, solution_dtype, compute_makespans,
+                   _find_swap_nb, decode_solution, plot_gantt)
 
 
-def mutate(solution, strength=1):
-    mutant = solution.copy()
+@njit(cache=True)
+def _mutate_inplace_nb(mutant, strength, rng):
+    """Apply `strength` adjacent swaps of different jobs to `mutant` in place."""
     for _ in range(strength):
-        mutant = get_neighbor(mutant)
+        i = _find_swap_nb(mutant, rng)
+        if i >= 0:
+            tmp = mutant[i]
+            mutant[i] = mutant[i + 1]
+            mutant[i + 1] = tmp
+
+
+@njit(cache=True)
+def mutate_nb(solution, strength, rng):
+    """
+    Copy the solution once, then apply `strength` adjacent swaps
+    of different jobs in place (same move as get_neighbor_nb).
+    `rng` is a np.random.Generator.
+    """
+    mutant = solution.copy()
+    _mutate_inplace_nb(mutant, strength, rng)
     return mutant
 
 
+@njit(cache=True)
+def _make_offspring_nb(pop_sols, parents, mu, strength, rng):
+    """
+    For each k, copy parent row parents[k] into row mu + k of pop_sols
+    and mutate it there (no temporary array per offspring).
+    """
+    for k in range(parents.shape[0]):
+        child = pop_sols[mu + k]
+        child[:] = pop_sols[parents[k]]
+        _mutate_inplace_nb(child, strength, rng)
+
+
 def evolution_strategy(instance, mu=10, lam=30, generations=500,
                        initial_strength=5, seed=None):
-    if seed is not None:
-        random.seed(seed)
+    rng = np.random.default_rng(seed)
 
     num_jobs = instance['num_jobs']
     num_machines = instance['num_machines']
 
+    # Population stored as two parallel arrays:
+    # rows [0, μ) hold the parents, rows [μ, μ+λ) the offspring of the current generation
+    pop_sols = np.empty((mu + lam, num_jobs * num_machines), solution_dtype(num_jobs))
+    pop_costs = np.empty(mu + lam, np.int32)
+    # Second buffer of the same shape: survivors are gathered into it, then the two are swapped
+    next_sols = np.empty_like(pop_sols)
+    next_costs = np.empty_like(pop_costs)
+    parent_costs = np.empty(lam, np.int32)
+
     # --- Step 1: Initialize μ random parents ---
-    population = []
-    for _ in range(mu):
-        sol = make_random_solution(num_jobs, num_machines)
-        cost = compute_makespan(sol, instance)
-        population.append((sol, cost))
+    for k in range(mu):
+        pop_sols[k] = make_random_solution(num_jobs, num_machines, rng)
+    pop_costs[:mu] = compute_makespans(pop_sols[:mu], instance)
 
     # Sort by cost (best first)
-    population.sort(key=lambda x: x[1])
+    order = np.argsort(pop_costs[:mu], kind='stable')
+    pop_sols[:mu] = pop_sols[order]
+    pop_costs[:mu] = pop_costs[order]
 
-    best_sol = population[0][0].copy()
-    best_cost = population[0][1]
+    best_sol = pop_sols[0].copy()
+    best_cost = int(pop_costs[0])
 
     strength = initial_strength
     history = {
         'best_cost': [best_cost],
-        'avg_cost': [sum(c for _, c in population) / len(population)],
+        'avg_cost': [float(pop_costs[:mu].mean())],
         'strength': [strength]
     }
 
     # --- Step 2: Main loop ---
     for gen in range(generations):
-        offspring = []
-        successes = 0
-
-        # Generate λ offspring by mutating random parents
-        for _ in range(lam):
-            # Pick a random parent from the μ best
-            parent_sol, parent_cost = random.choice(population[:mu])
+        # Pick a random parent from the μ best for each of the λ offspring
+        parents = rng.integers(0, mu, size=lam)
+        parent_costs[:] = pop_costs[parents]
 
-            # Mutate with current strength
-            child_sol = mutate(parent_sol, strength=max(1, int(strength)))
-            child_cost = compute_makespan(child_sol, instance)
+        # Generate λ offspring by mutating the chosen parents with current strength
+        _make_offspring_nb(pop_sols, parents, mu, max(1, int(strength)), rng)
 
-            offspring.append((child_sol, child_cost))
+        # Evaluate all λ offspring at once (in parallel)
+        pop_costs[mu:] = compute_makespans(pop_sols[mu:], instance)
 
-            # Count successes for the 1/5 rule
-            if child_cost < parent_cost:
-                successes += 1
+        # Count successes for the 1/5 rule
+        successes = int(np.count_nonzero(pop_costs[mu:] < parent_costs))
 
         # --- Step 3: Select μ best from parents + offspring (the "+" strategy) ---
-        combined = population + offspring
-        combined.sort(key=lambda x: x[1])
-        population = combined[:mu]
+        # (stable sort: on equal cost, parents stay ahead of offspring)
+        idx = np.argsort(pop_costs, kind='stable')[:mu]
+        # (mode='clip' lets take write straight into out; idx is always in range)
+        np.take(pop_sols, idx, axis=0, out=next_sols[:mu], mode='clip')
+        np.take(pop_costs, idx, out=next_costs[:mu], mode='clip')
+        pop_sols, next_sols = next_sols, pop_sols
+        pop_costs, next_costs = next_costs, pop_costs
 
         # Update best
-        if population[0][1] < best_cost:
-            best_sol = population[0][0].copy()
-            best_cost = population[0][1]
+        if pop_costs[0] < best_cost:
+            best_sol = pop_sols[0].copy()
+            best_cost = int(pop_costs[0])
 
         # --- Step 4: Adapt mutation strength (Rechenberg's 1/5 rule) ---
         success_rate = successes / lam
@@ -87,7 +123,7 @@ def evolution_strategy(instance, mu=10, lam=30, generations=500,
         strength = max(1, min(strength, 20))  # Clamp to [1, 20]
 
         # Record history
-        avg_cost = sum(c for _, c in population) / len(population)
+        avg_cost = float(pop_costs[:mu].mean())
         history['best_cost'].append(best_cost)
         history['avg_cost'].append(avg_cost)
         history['strength'].append(strength)
@@ -8,69 +8,106 @@ Usage:
 
 import sys
 import math
-import random
+import numpy as np
+from numba import njit
 from utils import (parse_instances, parse_single_instance,
-                   make_random_solution, compute_makespan, get_neighbor,
-                   decode_solution, plot_gantt)
-
-
-def simulated_annealing(instance, T_start=100.0, T_min=0.1, alpha=0.995,
-                        max_iter=1000, seed=None):
-    if seed is not None:
-        random.seed(seed)
-
-    num_jobs = instance['num_jobs']
-    num_machines = instance['num_machines']
-
-    # Initial random solution
-    current = make_random_solution(num_jobs, num_machines)
-    current_cost = compute_makespan(current, instance)
+                   make_random_solution, compute_makespan, _decode_makespan_nb,
+                   _find_swap_nb, decode_solution, plot_gantt)
+
+
+@njit(cache=True)
+def _sa_core(current, current_cost, job_machines, job_durations, num_jobs, num_machines,
+             T_start, T_min, alpha, max_iter, rng):
+    """
+    Whole SA loop in one Numba function. `current` is modified in place.
+    `rng` is a np.random.Generator.
+    """
+    # Number of temperature levels (same float arithmetic as the main loop)
+    num_levels = 0
+    T = T_start
+    while T > T_min:
+        num_levels += 1
+        T *= alpha
 
     best = current.copy()
     best_cost = current_cost
 
-    history = {
-        'current_cost': [current_cost],
-        'best_cost': [best_cost],
-        'temperature': [T_start],
-        'accepted_worse': 0,
-        'total_moves': 0
-    }
+    current_hist = np.empty(num_levels + 1, np.int32)
+    best_hist = np.empty(num_levels + 1, np.int32)
+    temp_hist = np.empty(num_levels + 1, np.float64)
+    current_hist[0] = current_cost
+    best_hist[0] = best_cost
+    temp_hist[0] = T_start
+    accepted_worse = 0
+    total_moves = 0
 
     T = T_start
 
-    while T > T_min:
+    for level in range(1, num_levels + 1):
         for _ in range(max_iter):
-            neighbor = get_neighbor(current)
-            neighbor_cost = compute_makespan(neighbor, instance)
+            total_moves += 1
+
+            # Neighbor: swap two adjacent elements of different jobs (see get_neighbor_nb),
+            # done in place and undone if rejected
+            i = _find_swap_nb(current, rng)
+            if i < 0:
+                continue
+            tmp = current[i]
+            current[i] = current[i + 1]
+            current[i + 1] = tmp
+            neighbor_cost = _decode_makespan_nb(current, job_machines, job_durations,
+                                                num_jobs, num_machines)
 
             delta = neighbor_cost - current_cost
 
-            if delta < 0:
-                # Better → always accept
-                current = neighbor
+            # Metropolis criterion without a data-dependent branch:
+            # better → probability 1, worse → probability e^(-delta / T)
+            accept = rng.random() < math.exp(min(0.0, -delta / T))
+            accepted_worse += accept & (delta >= 0)
+
+            if accept:
                 current_cost = neighbor_cost
+                if current_cost < best_cost:
+                    best[:] = current
+                    best_cost = current_cost
             else:
-                # Worse → accept with probability e^(-delta / T) (Metropolis criterion)
-                probability = math.exp(-delta / T)
-                if random.random() < probability:
-                    current = neighbor
-                    current_cost = neighbor_cost
-                    history['accepted_worse'] += 1
+                # Undo the swap
+                current[i + 1] = current[i]
+                current[i] = tmp
 
-            history['total_moves'] += 1
+        current_hist[level] = current_cost
+        best_hist[level] = best_cost
+        temp_hist[level] = T
 
-            if current_cost < best_cost:
-                best = current.copy()
-                best_cost = current_cost
+        T *= alpha  # Geometric cooling
 
-        history['current_cost'].append(current_cost)
-        history['best_cost'].append(best_cost)
-        history['temperature'].append(T)
+    return best, best_cost, best_hist, current_hist, temp_hist, accepted_worse, total_moves
 
-        T *= alpha  # Geometric cooling
 
-    return best, best_cost, history
+def simulated_annealing(instance, T_start=100.0, T_min=0.1, alpha=0.995,
+                        max_iter=1000, seed=None):
+    rng = np.random.default_rng(seed)
+
+    num_jobs = instance['num_jobs']
+    num_machines = instance['num_machines']
+
+    # Initial random solution
+    current = make_random_solution(num_jobs, num_machines, rng)
+    current_cost = compute_makespan(current, instance)
+
+    best, best_cost, best_hist, current_hist, temp_hist, accepted_worse, total_moves = _sa_core(
+        current, current_cost, instance['machines'], instance['durations'],
+        num_jobs, num_machines, float(T_start), float(T_min), float(alpha), max_iter, rng)
+
+    history = {
+        'current_cost': current_hist.tolist(),
+        'best_cost': best_hist.tolist(),
+        'temperature': temp_hist.tolist(),
+        'accepted_worse': accepted_worse,
+        'total_moves': total_moves
+    }
+
+    return best, int(best_cost), history
 
 
 # =============================================================================
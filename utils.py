@@ -3,65 +3,69 @@ Shared utilities for Job Shop Scheduling algorithms.
 Includes: instance parser, solution encoding, makespan computation, and Gantt chart.
 """
 
-import random
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from numba import njit, prange
 
 
 # =============================================================================
 # 1. INSTANCE PARSING
 # =============================================================================
 
+# States of the line-by-line parsers
+EXPECT_HEADER, EXPECT_DIMS, READ_JOBS = 0, 1, 2
+
+
 def parse_instances(filepath):
     """
     Parse all instances from a jobshop.txt file.
+    The file is read line by line (never loaded whole): 'instance <name>',
+    then the dimensions line, then one line per job.
     
     Returns:
-        dict: {instance_name: {'num_jobs', 'num_machines', 'jobs'}}
-              where jobs[j][k] = (machine_id, processing_time) for job j, operation k.
+        dict: {instance_name: {'num_jobs', 'num_machines', 'jobs', 'machines', 'durations'}}
+              where jobs[j][k] = (machine_id, processing_time) for job j, operation k,
+              and machines[j, k] / durations[j, k] hold the same data as np.int32 arrays.
     """
     instances = {}
+    state = EXPECT_HEADER
 
     with open(filepath, 'r') as f:
-        lines = f.readlines()
+        for line in f:
+            line = line.strip()
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+            if state == EXPECT_HEADER:
+                if line.startswith('instance '):
+                    name = line.split('instance ')[1].strip()
+                    state = EXPECT_DIMS
 
-        if line.startswith('instance '):
-            name = line.split('instance ')[1].strip()
-
-            i += 1
-            while i < len(lines):
-                line = lines[i].strip()
-                i += 1
-                if line == '' or line.startswith('+'):
-                    continue
+            elif state == EXPECT_DIMS:
                 parts = line.split()
                 if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
                     num_jobs, num_machines = int(parts[0]), int(parts[1])
-                    break
-
-            jobs = []
-            for _ in range(num_jobs):
-                while i < len(lines):
-                    line = lines[i].strip()
-                    i += 1
-                    if line and not line.startswith('+'):
-                        break
-
-                values = list(map(int, line.split()))
-                operations = [(values[k], values[k + 1]) for k in range(0, len(values), 2)]
-                jobs.append(operations)
-
-            instances[name] = {
-                'num_jobs': num_jobs,
-                'num_machines': num_machines,
-                'jobs': jobs
-            }
-        else:
-            i += 1
+                    jobs = []
+                    machines = np.zeros((num_jobs, num_machines), np.int32)
+                    durations = np.zeros((num_jobs, num_machines), np.int32)
+                    state = READ_JOBS
+
+            elif line and not line.startswith('+'):  # READ_JOBS
+                j = len(jobs)
+                # (machine, duration) pairs parsed by numpy's C parser, one row per operation
+                ops = np.fromstring(line, dtype=np.int32, sep=' ').reshape(-1, 2)
+                jobs.append(list(map(tuple, ops.tolist())))
+                machines[j] = ops[:, 0]
+                durations[j] = ops[:, 1]
+
+                if len(jobs) == num_jobs:
+                    instances[name] = {
+                        'num_jobs': num_jobs,
+                        'num_machines': num_machines,
+                        'jobs': jobs,
+                        'machines': machines,
+                        'durations': durations
+                    }
+                    state = EXPECT_HEADER
 
     return instances
 
@@ -71,55 +75,81 @@ def parse_single_instance(filepath):
     Parse a single instance file (just the dimensions line + job lines, no headers).
     Falls back to parse_instances if the file contains named instances.
     """
+    state = EXPECT_DIMS
+    jobs = []
+
     with open(filepath, 'r') as f:
-        lines = [l.strip() for l in f.readlines() if l.strip() and not l.strip().startswith('+')]
-
-    # Check if file has named instances
-    for line in lines:
-        if line.startswith('instance '):
-            all_instances = parse_instances(filepath)
-            raise ValueError(
-                f"File contains {len(all_instances)} named instances. "
-                f"Specify one as a second argument.\n"
-                f"Available: {', '.join(list(all_instances.keys())[:15])}..."
-            )
-
-    # Otherwise, parse as a single instance
-    # Find the dimensions line (first line with exactly 2 integers)
-    for idx, line in enumerate(lines):
-        parts = line.split()
-        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-            num_jobs, num_machines = int(parts[0]), int(parts[1])
-            break
-    else:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('+'):
+                continue
+
+            # Check if file has named instances
+            if line.startswith('instance '):
+                all_instances = parse_instances(filepath)
+                raise ValueError(
+                    f"File contains {len(all_instances)} named instances. "
+                    f"Specify one as a second argument.\n"
+                    f"Available: {', '.join(list(all_instances.keys())[:15])}..."
+                )
+
+            if state == EXPECT_DIMS:
+                # Find the dimensions line (first line with exactly 2 integers)
+                parts = line.split()
+                if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                    num_jobs, num_machines = int(parts[0]), int(parts[1])
+                    machines = np.zeros((num_jobs, num_machines), np.int32)
+                    durations = np.zeros((num_jobs, num_machines), np.int32)
+                    state = READ_JOBS
+
+            elif len(jobs) < num_jobs:  # READ_JOBS
+                j = len(jobs)
+                # (machine, duration) pairs parsed by numpy's C parser, one row per operation
+                ops = np.fromstring(line, dtype=np.int32, sep=' ').reshape(-1, 2)
+                jobs.append(list(map(tuple, ops.tolist())))
+                machines[j] = ops[:, 0]
+                durations[j] = ops[:, 1]
+
+    if state == EXPECT_DIMS:
         raise ValueError("Could not find dimensions line (num_jobs num_machines)")
+    if len(jobs) < num_jobs:
+        raise ValueError(f"Expected {num_jobs} job lines, found {len(jobs)}")
 
-    jobs = []
-    for j in range(num_jobs):
-        values = list(map(int, lines[idx + 1 + j].split()))
-        operations = [(values[k], values[k + 1]) for k in range(0, len(values), 2)]
-        jobs.append(operations)
-
-    return {'num_jobs': num_jobs, 'num_machines': num_machines, 'jobs': jobs}
+    return {'num_jobs': num_jobs, 'num_machines': num_machines, 'jobs': jobs,
+            'machines': machines, 'durations': durations}
 
 
 # =============================================================================
 # 2. SOLUTION REPRESENTATION
 # =============================================================================
 
-def make_random_solution(num_jobs, num_machines):
+def solution_dtype(num_jobs):
+    """
+    Smallest unsigned integer dtype that can hold every job ID:
+    uint8 up to 256 jobs (1 byte per entry), then uint16, then int32.
+    """
+    if num_jobs <= 256:
+        return np.uint8
+    if num_jobs <= 65536:
+        return np.uint16
+    return np.int32
+
+
+def make_random_solution(num_jobs, num_machines, rng=None):
     """
-    Create a random permutation-with-repetition solution.
-    Each job ID appears num_machines times; we shuffle them randomly.
+    Create a random permutation-with-repetition solution
+    (integer array of dtype solution_dtype(num_jobs)).
+    Each job ID appears num_machines times; we shuffle them randomly
+    with `rng` (a np.random.Generator, a fresh unseeded one if None).
     
     Example for 3 jobs × 2 machines: [0, 1, 2, 0, 2, 1]
     → 1st op of job 0, 1st op of job 1, 1st op of job 2,
       2nd op of job 0, 2nd op of job 2, 2nd op of job 1
     """
-    solution = []
-    for job_id in range(num_jobs):
-        solution.extend([job_id] * num_machines)
-    random.shuffle(solution)
+    if rng is None:
+        rng = np.random.default_rng()
+    solution = np.repeat(np.arange(num_jobs, dtype=solution_dtype(num_jobs)), num_machines)
+    rng.shuffle(solution)
     return solution
 
 
@@ -127,12 +157,15 @@ def make_random_solution(num_jobs, num_machines):
 # 3. DECODING & MAKESPAN
 # =============================================================================
 
-def decode_solution(solution, instance):
+def decode_solution(solution, instance, collect=True):
     """
     Decode a permutation-with-repetition into a full schedule.
     
+    With collect=False the (job, op, machine, start, end) tuples are not
+    built at all and schedule is None: use it when only the makespan matters.
+    
     Returns:
-        schedule: list of (job, op_index, machine, start, end)
+        schedule: list of (job, op_index, machine, start, end), or None
         makespan: total completion time
     """
     jobs = instance['jobs']
@@ -142,7 +175,8 @@ def decode_solution(solution, instance):
     job_end_time = [0] * len(jobs)
     machine_end_time = [0] * num_machines
 
-    schedule = []
+    schedule = [] if collect else None
+    makespan = 0  # running max of machine_end_time (end times only grow)
 
     for job_id in solution:
         op_idx = job_op_count[job_id]
@@ -151,47 +185,110 @@ def decode_solution(solution, instance):
         start = max(job_end_time[job_id], machine_end_time[machine])
         end = start + duration
 
-        schedule.append((job_id, op_idx, machine, start, end))
+        if collect:
+            schedule.append((job_id, op_idx, machine, start, end))
 
         job_end_time[job_id] = end
         machine_end_time[machine] = end
         job_op_count[job_id] = op_idx + 1
+        if end > makespan:
+            makespan = end
 
-    makespan = max(machine_end_time)
     return schedule, makespan
 
 
-def compute_makespan(solution, instance):
-    _, makespan = decode_solution(solution, instance)
+@njit(cache=True, boundscheck=False)
+def _decode_makespan_nb(solution, job_machines, job_durations, num_jobs, num_machines):
+    """
+    Same scheduling loop as decode_solution, compiled with Numba.
+    Works on integer arrays and only returns the makespan (no schedule list).
+    """
+    job_op_count = np.zeros(num_jobs, np.int32)
+    job_end = np.zeros(num_jobs, np.int32)
+    machine_end = np.zeros(num_machines, np.int32)
+    makespan = 0
+
+    for k in range(solution.shape[0]):
+        j = solution[k]
+        o = job_op_count[j]
+        m = job_machines[j, o]
+        d = job_durations[j, o]
+
+        s = job_end[j] if job_end[j] > machine_end[m] else machine_end[m]
+        e = s + d
+
+        job_end[j] = e
+        machine_end[m] = e
+        job_op_count[j] = o + 1
+        if e > makespan:
+            makespan = e
+
     return makespan
 
 
+def compute_makespan(solution, instance):
+    """
+    Makespan of a solution (list or array), without building the schedule.
+    Uses the Numba kernel when the instance carries its int32 arrays,
+    otherwise the pure-Python loop of decode_solution.
+    """
+    if 'machines' not in instance:
+        _, makespan = decode_solution(solution, instance, collect=False)
+        return makespan
+    if not isinstance(solution, np.ndarray):
+        solution = np.array(solution, solution_dtype(instance['num_jobs']))
+    return int(_decode_makespan_nb(solution, instance['machines'], instance['durations'],
+                                   instance['num_jobs'], instance['num_machines']))
+
+
+@njit(parallel=True, cache=True)
+def makespan_batch(solutions, job_machines, job_durations, num_jobs, num_machines):
+    """Makespan of each row of a 2D integer array, rows evaluated in parallel."""
+    out = np.empty(solutions.shape[0], np.int32)
+    for k in prange(solutions.shape[0]):
+        out[k] = _decode_makespan_nb(solutions[k], job_machines, job_durations,
+                                     num_jobs, num_machines)
+    return out
+
+
+def compute_makespans(solutions, instance):
+    """Makespans of a stack of solutions (2D integer array, one per row)."""
+    return makespan_batch(solutions, instance['machines'], instance['durations'],
+                          instance['num_jobs'], instance['num_machines'])
+
+
 # =============================================================================
 # 4. NEIGHBORHOOD
 # =============================================================================
 
-def get_neighbor(solution):
+@njit(cache=True)
+def _find_swap_nb(solution, rng):
+    """
+    Random position i such that solution[i] and solution[i + 1] belong
+    to different jobs (at most n tries), or -1 if none was found.
+    """
+    n = solution.shape[0]
+    for _ in range(n):
+        i = rng.integers(0, n - 1)
+        if solution[i] != solution[i + 1]:
+            return i
+    return -1
+
+
+@njit(cache=True)
+def get_neighbor_nb(solution, rng):
     """
     Generate a neighbor by swapping two adjacent elements
-    that belong to different jobs.
+    that belong to different jobs (unchanged copy if no such pair was hit).
+    `rng` is a np.random.Generator.
     """
     neighbor = solution.copy()
-    n = len(neighbor)
-
-    attempts = 0
-    while attempts < n:
-        i = random.randint(0, n - 2)
-        if neighbor[i] != neighbor[i + 1]:
-            neighbor[i], neighbor[i + 1] = neighbor[i + 1], neighbor[i]
-            return neighbor
-        attempts += 1
-
-    # Fallback: swap two random positions with different jobs
-    # while True:
-    #     i, j = random.sample(range(n), 2)
-    #     if neighbor[i] != neighbor[j]:
-    #         neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
-    #         return neighbor
+    i = _find_swap_nb(neighbor, rng)
+    if i >= 0:
+        tmp = neighbor[i]
+        neighbor[i] = neighbor[i + 1]
+        neighbor[i + 1] = tmp
+    return neighbor
 
 
 # =============================================================================